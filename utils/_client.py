@@ -0,0 +1,29 @@
+import os
+from functools import lru_cache
+from importlib.util import find_spec
+
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it.
+HTTP2 = find_spec("h2") is not None
+
+
+# The SDK is imported on first use, so cache hits and other paths that never
+# call the API don't pay for loading anthropic/httpx.
+@lru_cache(maxsize=1)
+def get_client():
+    # One client per process so every call reuses the same connection pool
+    # and TLS session instead of setting up a new one. DefaultHttpxClient
+    # keeps the SDK's own timeout and keep-alive defaults.
+    from anthropic import Anthropic, DefaultHttpxClient
+    return Anthropic(
+        api_key=os.getenv("ANTHROPIC_API_KEY"),
+        http_client=DefaultHttpxClient(http2=HTTP2),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_client():
+    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+    return AsyncAnthropic(
+        api_key=os.getenv("ANTHROPIC_API_KEY"),
+        http_client=DefaultAsyncHttpxClient(http2=HTTP2),
+    )
@@ -1,113 +1,472 @@
 import os
+import sys
 import json
-from anthropic import Anthropic
+import time
+import random
+import hashlib
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from _client import get_client
 
+# io_uring bindings are optional; without them (or off Linux, or where the
+# kernel refuses io_uring) notes are read with a thread pool instead.
+liburing = None
+if sys.platform == "linux":
+    try:
+        import liburing
+    except ImportError:
+        pass
+
+
+MODEL = "claude-3-5-haiku-20241022"
+MAX_TOKENS = 2000
+# seconds between batch status checks when using the Message Batches API
+POLL_INTERVAL = 5
+# limit size of the style corpus to avoid hitting token limits
+MAX_CORPUS_CHARS = 12000
+# every sampled note gets at least this many bytes (or the whole note)
+MIN_NOTE_BYTES = 1500
+# notes are stat()ed this many at a time when sampling the corpus
+SAMPLE_CANDIDATES = 64
+SAMPLE_SEED = 0
+READ_WORKERS = 16
+URING_BATCH = 256
+# Shared by every request; sent through the system parameter rather than
+# repeated at the top of each prompt.
+SYSTEM_PREFIX = ("You are an assistant that rewrites lecture transcripts in the same tone and style "
+                 "as the user's previous Obsidian notes.")
+# Prompt templates, split around their variable slot so building a prompt is
+# a plain concatenation.
+_SUMMARIZE_TMPL = (
+    "\n    Here are examples of their note-taking style:\n    ---\n    ",
+    "\n    ---\n\n    List out user's note-taking styles in bullet points and summarize. Make it markdown code heavy so with later prompting they know how to achieve the same formatting. Do not ask follow up question. This will be used for further AI prompting, so keep it all in one answer.\n    ",
+)
+_STYLE_TMPL = (
+    "\n    The user's lecture notes style can be summarized as this\n    ---\n    ",
+    "\n    ---\n    ",
+)
+_TRANSCRIPT_TMPL = (
+    "\n    Restyle transcript to formatted lecture notes that looks like how user will write them.\n    ---\n    ",
+    "\n    ---\n    Do not ask follow up question. This will be used for further AI prompting, so keep it all in one answer.\n    ",
+)
+_PART_TMPL = (
+    "\n    Above is a lecture transcript split into {parts} parts, each starting with a \"Part N:\" label, up to \"Part {part}:\". The earlier parts have already been turned into notes and are only there for context."
+    "\n    Restyle only the text under \"Part {part}:\" to formatted lecture notes that looks like how user will write them, continuing from where the earlier parts left off."
+    "\n    Do not ask follow up question. This will be used for further AI prompting, so keep it all in one answer.\n    "
+)
+# transcripts longer than this (~2000 tokens) are restyled in parts
+TRANSCRIPT_CHUNK_CHARS = 8000
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "live-noter")
+CACHE_MAX_ENTRIES = 200
+
+def _text_block(message):
+    # The first block is almost always the text block, so check it before
+    # scanning the rest. Returns None if the response has no text block.
+    content = message.content
+    if content and content[0].type == 'text':
+        return content[0].text
+    return next((block.text for block in content if block.type == 'text'), None)
+
+def extract_text(message):
+    # Extract the actual text content from the response
+    text = _text_block(message)
+    if text is not None:
+        return text
+    if message.content:
+        # If no text block found, convert to string
+        return str(message.content[0])
+    return "No response generated"
+
+def build_request(custom_id, content):
+    from anthropic.types.message_create_params import MessageCreateParamsNonStreaming
+    from anthropic.types.messages.batch_create_params import Request
+    return Request(
+        custom_id=custom_id,
+        params=MessageCreateParamsNonStreaming(
+            model=MODEL,
+            max_tokens=MAX_TOKENS,
+            system=SYSTEM_PREFIX,
+            messages=[{"role": "user", "content": content}]
+        )
+    )
+
+def run_batch(requests, poll_interval=POLL_INTERVAL):
+    # Submit requests through the Message Batches API (half the cost of
+    # synchronous calls) and wait for the batch to finish.
+    # Returns a dict of custom_id -> response message.
+    client = get_client()
+    message_batch = client.messages.batches.create(requests=requests)
+    while message_batch.processing_status != "ended":
+        time.sleep(poll_interval)
+        message_batch = client.messages.batches.retrieve(message_batch.id)
+
+    results = {}
+    for entry in client.messages.batches.results(message_batch.id):
+        if entry.result.type == "succeeded":
+            results[entry.custom_id] = entry.result.message
+        else:
+            raise RuntimeError(f"Batch request {entry.custom_id} {entry.result.type}")
+    return results
+
+def _report_progress():
+    sys.stderr.write(".")
+    sys.stderr.flush()
+
+def _end_progress():
+    sys.stderr.write("\n")
+
+def complete(custom_id, content, batch=False, poll_interval=POLL_INTERVAL):
+    # content is either a prompt string or a list of content blocks
+    if batch:
+        return run_batch([build_request(custom_id, content)], poll_interval)[custom_id]
+
+    # Stream the response so tokens are received as they are generated;
+    # progress goes to stderr since stdout carries the final JSON.
+    with get_client().messages.stream(
+        model=MODEL,
+        max_tokens=MAX_TOKENS,
+        system=SYSTEM_PREFIX,
+        messages=[{"role": "user", "content": content}]
+    ) as stream:
+        for _ in stream.text_stream:
+            _report_progress()
+        response = stream.get_final_message()
+    _end_progress()
+    return response
+
+def complete_all(custom_id, contents, batch=False, poll_interval=POLL_INTERVAL):
+    # One request per content, kept in order; returns the response messages.
+    # They are sent one after another so each can reuse the prompt cache
+    # written by the one before; in batch mode they all go into a single
+    # batch job.
+    if batch:
+        ids = [f"{custom_id}-{i}" for i in range(len(contents))]
+        results = run_batch([build_request(i, c) for i, c in zip(ids, contents)], poll_interval)
+        return [results[i] for i in ids]
+    return [complete(custom_id, content) for content in contents]
+
+def _digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+# Responses are cached on disk keyed by a hash of the full request (model,
+# system prompt and message contents), so re-running with unchanged notes
+# and transcript skips the LLM call, while any prompt change misses.
+def _cache_path(custom_id, contents):
+    request = {"model": MODEL, "max_tokens": MAX_TOKENS, "system": SYSTEM_PREFIX, "contents": contents}
+    return os.path.join(CACHE_DIR, f"{custom_id}-{_digest(json.dumps(request, sort_keys=True))}.txt")
+
+def _cache_read(cache_path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as cached:
+            result = cached.read()
+        # bump the mtime so pruning drops the least recently used entries
+        os.utime(cache_path)
+        return result
+    except OSError:
+        return None
+
+def _cache_prune():
+    # Keep at most CACHE_MAX_ENTRIES files, removing the least recently used.
+    try:
+        with os.scandir(CACHE_DIR) as entries:
+            cached = [(entry.stat().st_mtime, entry.path) for entry in entries
+                      if entry.name.endswith(".txt") and entry.is_file()]
+        cached.sort()
+        for _, path in cached[:-CACHE_MAX_ENTRIES]:
+            os.remove(path)
+    except OSError as e:
+        print(f"Warning: Could not prune cache: {e}", file=sys.stderr)
+
+def _cache_write(cache_path, result):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as cached:
+            cached.write(result)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Could not write cache file: {e}", file=sys.stderr)
+        return
+    _cache_prune()
 
-client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+# contents holds one message content per request; the replies are joined.
+def cached_complete(custom_id, contents, batch=False, poll_interval=POLL_INTERVAL, use_cache=True):
+    cache_path = _cache_path(custom_id, contents)
+    result = _cache_read(cache_path) if use_cache else None
+    if result is None:
+        responses = complete_all(custom_id, contents, batch, poll_interval)
+        result = "\n\n".join(extract_text(response) for response in responses)
+        # fallback text for replies without a text block is never cached
+        if all(_text_block(response) is not None for response in responses):
+            _cache_write(cache_path, result)
+    return result
+
+def _decode_note(data, truncated):
+    # a note cut off at its byte budget may end mid-character
+    text = data.decode("utf-8", "ignore" if truncated else "strict")
+    # match text-mode reads, which translate \r\n and \r to \n
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if truncated:
+        # end on a whole line rather than partway through one
+        cut = text.rfind("\n")
+        if cut > 0:
+            text = text[:cut]
+    return text.strip()
+
+def _read_file(path, size, limit):
+    with open(path, "rb") as file:
+        return _decode_note(file.read(limit), limit < size)
+
+def _read_md_files_threaded(files):
+    # Read notes in parallel (file reads release the GIL). Only a small window
+    # of reads is in flight at a time, so once the caller stops consuming, the
+    # files further down the list are never opened.
+    pending = deque()
+    remaining = iter(files)
+    executor = ThreadPoolExecutor(max_workers=READ_WORKERS)
+    try:
+        for f in islice(remaining, READ_WORKERS * 2):
+            pending.append(executor.submit(_read_file, *f))
+        while pending:
+            yield pending.popleft().result()
+            f = next(remaining, None)
+            if f is not None:
+                pending.append(executor.submit(_read_file, *f))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def _uring_run(ring, prep_ops):
+    # Queue one SQE per op, submit them with a single syscall and collect the
+    # results by position. IOSQE_ASYNC forces the ops onto io_uring's worker
+    # pool instead of trying them inline first. Failed ops come back as the
+    # OSError the binding raises for them.
+    for i, prep in enumerate(prep_ops):
+        sqe = liburing.io_uring_get_sqe(ring)
+        prep(sqe)
+        liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_ASYNC)
+        liburing.io_uring_sqe_set_data64(sqe, i)
+    liburing.io_uring_submit_and_wait(ring, len(prep_ops))
+
+    results = [None] * len(prep_ops)
+    cqe = liburing.Cqe()
+    done = 0
+    while done < len(prep_ops):
+        liburing.io_uring_peek_cqe(ring, cqe)
+        ready = liburing.io_uring_cq_ready(ring)
+        for i in range(ready):
+            entry = cqe[i]
+            index = liburing.io_uring_cqe_get_data64(entry)
+            try:
+                results[index] = entry.res
+            except OSError as e:
+                results[index] = e
+        liburing.io_uring_cq_advance(ring, ready)
+        done += ready
+    return results
+
+def _raise_uring_error(paths, results):
+    for path, result in zip(paths, results):
+        if isinstance(result, OSError):
+            raise OSError(result.errno, result.strerror, path)
+
+def _open_ring():
+    # The kernel or a seccomp profile (e.g. Docker's default) may refuse
+    # io_uring even when the bindings import; returns None in that case.
+    ring = liburing.Ring()
+    try:
+        liburing.io_uring_queue_init(URING_BATCH, ring)
+    except OSError:
+        return None
+    return ring
+
+def _read_md_files_uring(ring, files):
+    # Batch open/read/close for up to URING_BATCH files per round trip, reading
+    # only each file's byte budget.
+    try:
+        files = iter(files)
+        while chunk := list(islice(files, URING_BATCH)):
+            paths = [path for path, _, _ in chunk]
+            fds = _uring_run(ring, [
+                lambda sqe, p=p: liburing.io_uring_prep_open(sqe, p, os.O_RDONLY)
+                for p in paths
+            ])
+            try:
+                _raise_uring_error(paths, fds)
+                buffers = [bytearray(limit) for _, _, limit in chunk]
+                sizes = _uring_run(ring, [
+                    lambda sqe, fd=fd, buf=buf: liburing.io_uring_prep_read(sqe, fd, buf, 0)
+                    for fd, buf in zip(fds, buffers)
+                ])
+            finally:
+                _uring_run(ring, [
+                    lambda sqe, fd=fd: liburing.io_uring_prep_close(sqe, fd)
+                    for fd in fds if isinstance(fd, int)
+                ])
+            _raise_uring_error(paths, sizes)
+            for (_, size, limit), buf, n in zip(chunk, buffers, sizes):
+                yield _decode_note(bytes(buf[:n]), limit < size)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+
+def _iter_md(path):
+    # Same order as os.walk (a directory's files before its subdirectories),
+    # but DirEntry reuses the file type from the directory listing instead of
+    # stat()ing every entry. Unreadable directories are skipped like os.walk.
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(".md") and entry.is_file():
+                    yield entry.path
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from _iter_md(subdir)
+
+def _sample_notes(notes_dir):
+    # Pick a size-weighted sample of notes so the corpus covers the vault
+    # instead of only the first notes walked. Notes are drawn in random
+    # rounds of SAMPLE_CANDIDATES, so only as many files are stat()ed as it
+    # takes to fill the budget. The sample is seeded, so an unchanged vault
+    # gives the same corpus.
+    rng = random.Random(SAMPLE_SEED)
+    paths = sorted(_iter_md(notes_dir))
+    rng.shuffle(paths)
+
+    # Take notes while each can still be given at least MIN_NOTE_BYTES
+    # (or all of it, if it is smaller).
+    picked = []
+    reserved = 0
+    for start in range(0, len(paths), SAMPLE_CANDIDATES):
+        candidates = []
+        for path in paths[start:start + SAMPLE_CANDIDATES]:
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                continue
+            if size > 0:
+                candidates.append((path, size))
+        # weighted sampling without replacement: larger notes tend to come first
+        candidates.sort(key=lambda note: rng.random() ** (1.0 / note[1]), reverse=True)
+        for path, size in candidates:
+            share = min(size, MIN_NOTE_BYTES)
+            if reserved + share > MAX_CORPUS_CHARS:
+                return picked
+            picked.append((path, size))
+            reserved += share
+    return picked
+
+def _sample_budgets(notes_dir):
+    # Split the corpus budget over the sampled notes: notes smaller than an
+    # even share are read whole and the rest of the budget is divided evenly
+    # among the larger ones, which is never less than MIN_NOTE_BYTES each.
+    # Returns (path, size, bytes_to_read) in sample order.
+    picked = _sample_notes(notes_dir)
+    budgets = {}
+    remaining = MAX_CORPUS_CHARS
+    by_size = sorted(picked, key=lambda note: note[1])
+    for i, (path, size) in enumerate(by_size):
+        budgets[path] = min(size, remaining // (len(by_size) - i))
+        remaining -= budgets[path]
+    return [(path, size, budgets[path]) for path, size in picked]
 
 def take_text(notes_dir):
-    all_text = ""
-    for root, _, files in os.walk(notes_dir):
-        for f in files:
-            if f.endswith(".md"):
-                path = os.path.join(root, f)
-                with open(path, "r", encoding="utf-8") as file:
-                    content = file.read().strip()
-                    all_text += content + "\n\n"
+    files = _sample_budgets(notes_dir)
+
+    ring = _open_ring() if liburing is not None else None
+    if ring is not None:
+        contents = _read_md_files_uring(ring, files)
+    else:
+        contents = _read_md_files_threaded(files)
+
+    parts = []
+    total = 0
+    try:
+        for content in contents:
+            parts.append(content)
+            parts.append("\n\n")
+            total += len(content) + 2
+            if total >= MAX_CORPUS_CHARS:
+                break
+    finally:
+        contents.close()
     # limit size to avoid hitting token limits
-    return all_text[:12000]
+    return "".join(parts)[:MAX_CORPUS_CHARS]
 
-def summarize_style(notes_dir):
-    style_corpus = take_text(notes_dir)
+def summarize_prompt(style_corpus):
+    return _SUMMARIZE_TMPL[0] + style_corpus + _SUMMARIZE_TMPL[1]
 
-    prompt = f"""
-    You are an assistant that rewrites lecture transcripts in the same tone and style
-    as the user's previous Obsidian notes.
+def split_transcript(transcript, size=TRANSCRIPT_CHUNK_CHARS):
+    # Cut the transcript into pieces of at most `size` characters, breaking
+    # after a newline where possible, else after a space.
+    chunks = []
+    start = 0
+    while len(transcript) - start > size:
+        end = start + size
+        cut = transcript.rfind("\n", start, end)
+        if cut <= start:
+            cut = transcript.rfind(" ", start, end)
+        if cut <= start:
+            cut = end - 1
+        chunks.append(transcript[start:cut + 1])
+        start = cut + 1
+    chunks.append(transcript[start:])
+    return [chunk for chunk in chunks if chunk.strip()]
 
-    Here are examples of their note-taking style:
-    ---
-    {style_corpus}
-    ---
+def adapt_contents(transcript, style_summarization):
+    # The instructions and style summary are the same for every transcript, so
+    # they go in their own block marked for prompt caching; only the transcript
+    # part is billed at the full input rate on later lectures.
+    style_prefix = _STYLE_TMPL[0] + style_summarization + _STYLE_TMPL[1]
+    style_block = {"type": "text", "text": style_prefix, "cache_control": {"type": "ephemeral"}}
 
-    List out user's note-taking styles in bullet points and summarize. Make it markdown code heavy so with later prompting they know how to achieve the same formatting. Do not ask follow up question. This will be used for further AI prompting, so keep it all in one answer.
-    """
+    chunks = split_transcript(transcript)
+    if len(chunks) <= 1:
+        transcript_part = _TRANSCRIPT_TMPL[0] + transcript + _TRANSCRIPT_TMPL[1]
+        return [[style_block, {"type": "text", "text": transcript_part}]]
 
-    response = client.messages.create(
-        model="claude-3-5-haiku-20241022",
-        max_tokens=2000,
-        messages=[{"role": "user", "content": prompt}]
-    )
-    # Extract the actual text content from the response
-    if response.content and len(response.content) > 0:
-        for block in response.content:
-            if block.type == 'text':
-                return block.text
-        # If no text block found, convert to string
-        return str(response.content[0])
-    else:
-        return "No response generated"
-
-
-def adapt_style(transcript, style_summarization):
-    prompt = f"""
-    You are an assistant that rewrites lecture transcripts in the same tone and style
-    as the user's previous Obsidian notes.
-
-    The user's lecture notes style can be summarized as this
-    ---
-    {style_summarization}
-    ---
-
-    Restyle transcript to formatted lecture notes that looks like how user will write them.
-    ---
-    {transcript}
-    ---
-    Do not ask follow up question. This will be used for further AI prompting, so keep it all in one answer.
-    """
-
-    response = client.messages.create(
-        model="claude-3-5-haiku-20241022",
-        max_tokens=2000,
-        messages=[{"role": "user", "content": prompt}]
-    )
-    # Extract the actual text content from the response
-    if response.content and len(response.content) > 0:
-        for block in response.content:
-            if block.type == 'text':
-                return block.text
-        # If no text block found, convert to string
-        return str(response.content[0])
-    else:
-        return "No response generated"
+    # Long transcripts are restyled one part at a time. Request i sends parts
+    # 0..i as separate blocks, so everything before part i is exactly the
+    # prefix request i-1 cached and only the new part is prefilled. Each part
+    # starts with a fixed "Part N:" label for the instructions to point at.
+    labelled = [f"Part {i + 1}:\n{chunk}" for i, chunk in enumerate(chunks)]
+    contents = []
+    for i in range(len(chunks)):
+        chunk_blocks = [{"type": "text", "text": chunk} for chunk in labelled[:i + 1]]
+        chunk_blocks[-1]["cache_control"] = {"type": "ephemeral"}
+        instructions = _PART_TMPL.format_map({"parts": len(chunks), "part": i + 1})
+        contents.append([style_block, *chunk_blocks, {"type": "text", "text": instructions}])
+    return contents
 
-if __name__ == "__main__":
-    import sys
-    # CLI usage:
-    # 1) learn-only mode: python learn_style.py <notes_dir> __learn_only__
-    #    prints JSON {"style_corpus": "..."}
-    # 2) full mode: python learn_style.py <notes_dir> <transcript_path>
-    #    reads transcript file and prints JSON {"styled": "..."}
-    if len(sys.argv) != 3:
-        print("Usage: python learn_style.py <notes_dir> <transcript_path>\n       or: python learn_style.py <notes_dir> __learn_only__")
-        exit(1)
+def summarize_style(notes_dir, batch=False, poll_interval=POLL_INTERVAL, use_cache=True):
+    style_corpus = take_text(notes_dir)
+    return cached_complete("summarize_style", [summarize_prompt(style_corpus)],
+                           batch, poll_interval, use_cache)
 
-    notes_dir, transcript_path = sys.argv[1], sys.argv[2]
-    
-    # Debug: Check API key
-    api_key = os.getenv('ANTHROPIC_API_KEY')
-    if not api_key:
-        print("Error: ANTHROPIC_API_KEY not found", file=sys.stderr)
-        exit(1)
-    
-    print(f"Debug: Processing notes from {notes_dir}", file=sys.stderr)
+def adapt_style(transcript, style_summarization, batch=False, poll_interval=POLL_INTERVAL, use_cache=True):
+    return cached_complete("adapt_style", adapt_contents(transcript, style_summarization),
+                           batch, poll_interval, use_cache)
 
-    # First, produce a summarization of the style from notes in notes_dir
-    try:
-        style_summarization = summarize_style(notes_dir)
-        print(f"Debug: Got style summarization of length {len(style_summarization)}", file=sys.stderr)
-    except Exception as e:
-        print(f"Error in summarize_style: {e}", file=sys.stderr)
-        exit(1)
+def read_transcript(transcript_path):
+    with open(transcript_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def main(notes_dir, transcript_path, batch=False, use_cache=True):
+    # First, produce a summarization of the style from notes in notes_dir.
+    # In full mode the transcript is read on a worker thread meanwhile.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        if transcript_path != "__learn_only__":
+            transcript_future = executor.submit(read_transcript, transcript_path)
+        try:
+            style_summarization = summarize_style(notes_dir, batch=batch, use_cache=use_cache)
+            print(f"Debug: Got style summarization of length {len(style_summarization)}", file=sys.stderr)
+        except Exception as e:
+            print(f"Error in summarize_style: {e}", file=sys.stderr)
+            exit(1)
 
     if transcript_path == "__learn_only__":
         # Save the style summarization to the plugin directory for user review
@@ -120,7 +479,8 @@ if __name__ == "__main__":
             with open(style_file_path, "w", encoding="utf-8") as style_file:
                 style_file.write("# Your Note-Taking Style Summary\n\n")
                 style_file.write(style_summarization)
-                style_file.write(f"\n\n---\nGenerated on: {os.popen('date').read().strip()}\n")
+                generated_on = datetime.now(timezone.utc).isoformat(timespec="seconds")
+                style_file.write(f"\n\n---\nGenerated on: {generated_on}\n")
             
             print(f"Debug: Style saved to {style_file_path}", file=sys.stderr)
         except Exception as e:
@@ -138,7 +498,35 @@ if __name__ == "__main__":
             exit(1)
         exit(0)
 
-    with open(transcript_path, "r", encoding="utf-8") as f:
-        transcript = f.read()
-    restyled_note = adapt_style(transcript, style_summarization)
+    transcript = transcript_future.result()
+    restyled_note = adapt_style(transcript, style_summarization, batch=batch, use_cache=use_cache)
     print(json.dumps({"restyled notes": restyled_note}))
+
+if __name__ == "__main__":
+    # CLI usage:
+    # 1) learn-only mode: python learn_style.py <notes_dir> __learn_only__
+    #    prints JSON {"style_corpus": "..."}
+    # 2) full mode: python learn_style.py <notes_dir> <transcript_path>
+    #    reads transcript file and prints JSON {"styled": "..."}
+    # Pass --batch to route the LLM calls through the Message Batches API
+    # (50% cheaper, but results can take minutes to come back).
+    # Pass --no-cache to ignore cached responses in ~/.cache/live-noter.
+    args = sys.argv[1:]
+    batch = "--batch" in args
+    use_cache = "--no-cache" not in args
+    args = [a for a in args if a not in ("--batch", "--no-cache")]
+    if len(args) != 2:
+        print("Usage: python learn_style.py [--batch] [--no-cache] <notes_dir> <transcript_path>\n       or: python learn_style.py [--batch] [--no-cache] <notes_dir> __learn_only__")
+        exit(1)
+
+    notes_dir, transcript_path = args[0], args[1]
+    
+    # Debug: Check API key
+    api_key = os.getenv('ANTHROPIC_API_KEY')
+    if not api_key:
+        print("Error: ANTHROPIC_API_KEY not found", file=sys.stderr)
+        exit(1)
+    
+    print(f"Debug: Processing notes from {notes_dir}", file=sys.stderr)
+
+    main(notes_dir, transcript_path, batch, use_cache)
@@ -1,35 +1,159 @@
 #!/usr/bin/env python3
 import os
 import sys
-import anthropic
+import json
+import asyncio
+import argparse
+from _client import get_client, get_async_client
+
+MODEL = 'claude-3-5-haiku-20241022'
+MAX_TOKENS = 2000
+
+# Callers put this marker between the part of the prompt that stays the same
+# across calls (instructions, style) and the part that changes. Everything
+# before it is sent as a separate block marked for prompt caching.
+CACHE_BREAK = '<<<CACHE_BREAK>>>'
+
+def build_content(prompt):
+    prefix, sep, rest = prompt.partition(CACHE_BREAK)
+    if not sep or not prefix.strip():
+        return prompt.replace(CACHE_BREAK, '')
+    return [
+        {'type': 'text', 'text': prefix, 'cache_control': {'type': 'ephemeral'}},
+        {'type': 'text', 'text': rest},
+    ]
+
+def extract_text(resp):
+    # Extract just the text content from TextBlock objects. Replies are
+    # nearly always a single text block, which needs no joining.
+    content = resp.content
+    if len(content) == 1 and content[0].type == 'text':
+        return content[0].text.strip()
+    text_content = ""
+    for block in content:
+        if block.type == 'text':
+            text_content += block.text
+        elif isinstance(block, str):
+            text_content += block
+    return text_content.strip()
+
+class RateLimiter:
+    # Spaces out request starts so no more than `rpm` begin in any minute.
+    def __init__(self, rpm):
+        self.interval = 60.0 / rpm
+        self.next_start = 0.0
+
+    async def acquire(self):
+        now = asyncio.get_running_loop().time()
+        wait = self.next_start - now
+        self.next_start = max(now, self.next_start) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+async def run_daemon(max_concurrency, rpm=None):
+    # Daemon mode: one long-lived process serves many prompts instead of one
+    # process spawn (and TLS handshake) per prompt. Each stdin line is a JSON
+    # object {"id": ..., "prompt": "..."}; each result is written as one JSON
+    # line {"id": ..., "line": n, "text": "..."} or {"id": ..., "line": n,
+    # "error": "..."}, in completion order. "id" is echoed as given (null if
+    # absent or unparseable) and "line" is the request's stdin line number.
+    client = get_async_client()
+    slots = asyncio.Semaphore(max_concurrency)
+    limiter = RateLimiter(rpm) if rpm else None
+    tasks = set()
+
+    async def handle(request_id, line_no, prompt):
+        try:
+            if limiter:
+                await limiter.acquire()
+            resp = await client.messages.create(
+                model=MODEL,
+                max_tokens=MAX_TOKENS,
+                messages=[{'role': 'user', 'content': build_content(prompt)}],
+            )
+            if resp.content:
+                result = {'id': request_id, 'line': line_no, 'text': extract_text(resp)}
+            else:
+                result = {'id': request_id, 'line': line_no, 'error': 'No content returned'}
+        except Exception as e:
+            result = {'id': request_id, 'line': line_no, 'error': 'LLM call failed: ' + str(e)}
+        finally:
+            slots.release()
+        print(json.dumps(result), flush=True)
+
+    line_no = 0
+    while True:
+        line = await asyncio.to_thread(sys.stdin.buffer.readline)
+        if not line:
+            break
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            prompt = request['prompt']
+        except (ValueError, AttributeError, KeyError) as e:
+            print(json.dumps({'id': None, 'line': line_no, 'error': 'Invalid request: ' + str(e)}), flush=True)
+            continue
+
+        # wait for a free slot before reading more, so a fast producer can't
+        # queue up an unbounded number of requests
+        await slots.acquire()
+        task = asyncio.create_task(handle(request_id, line_no, prompt))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    await asyncio.gather(*tasks)
+
+def positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f'must be a positive integer, got {value}')
+    return number
+
+def positive_float(value):
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f'must be a positive number, got {value}')
+    return number
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--daemon', action='store_true',
+                        help='serve newline-delimited JSON prompts from stdin until EOF')
+    parser.add_argument('--max-concurrency', type=positive_int, default=4,
+                        help='maximum requests in flight in daemon mode')
+    parser.add_argument('--rpm', type=positive_float, default=None,
+                        help='maximum requests started per minute in daemon mode')
+    args = parser.parse_args()
+
     api_key = os.getenv('ANTHROPIC_API_KEY')
     if not api_key:
         print('Missing ANTHROPIC_API_KEY env var', file=sys.stderr)
         sys.exit(2)
 
-    client = anthropic.Anthropic(api_key=api_key)
-    prompt = sys.stdin.read()
+    if args.daemon:
+        asyncio.run(run_daemon(args.max_concurrency, args.rpm))
+        return
+
+    client = get_client()
+    # Read and decode stdin in one pass rather than through the locale-dependent
+    # text wrapper; callers always send UTF-8.
+    prompt = sys.stdin.buffer.read().decode('utf-8')
     if not prompt:
         print('No prompt provided on stdin', file=sys.stderr)
         sys.exit(2)
 
     try:
         resp = client.messages.create(
-            model='claude-3-5-haiku-20241022',
-            max_tokens=2000,
-            messages=[{'role': 'user', 'content': prompt}],
+            model=MODEL,
+            max_tokens=MAX_TOKENS,
+            messages=[{'role': 'user', 'content': build_content(prompt)}],
         )
-        # Extract just the text content from TextBlock objects
         if resp.content:
-            text_content = ""
-            for block in resp.content:
-                if block.type == 'text':
-                    text_content += block.text
-                elif isinstance(block, str):
-                    text_content += block
-            print(text_content.strip())
+            sys.stdout.buffer.write(extract_text(resp).encode('utf-8'))
+            sys.stdout.buffer.write(b'\n')
         else:
             print("No content returned", file=sys.stderr)
             sys.exit(1)
@@ -6,6 +6,9 @@ import { fileURLToPath } from 'url';
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
+// Marks the end of the prompt prefix that llm_wrapper.py sends for prompt caching
+const CACHE_BREAK = '<<<CACHE_BREAK>>>';
+
 // Centralized configuration
 const CONFIG = {
   outputFile: path.join(process.cwd(), 'final_notes.md'), // Default fallback
@@ -27,13 +30,20 @@ async function loadState() {
   }
 }
 
+// Last style file read, reused until the file's mtime changes
+let styleCache = { mtimeMs: null, content: '' };
+
 /**
  * Load user's note-taking style
  */
 async function loadUserStyle() {
   try {
-    const styleContent = await fs.readFile(CONFIG.styleFile, 'utf8');
-    return styleContent.trim();
+    const { mtimeMs } = await fs.stat(CONFIG.styleFile);
+    if (styleCache.mtimeMs !== mtimeMs) {
+      const styleContent = await fs.readFile(CONFIG.styleFile, 'utf8');
+      styleCache = { mtimeMs, content: styleContent.trim() };
+    }
+    return styleCache.content;
   } catch {
     return ''; // Return empty string if style file doesn't exist
   }
@@ -60,7 +70,7 @@ ${userStyle}
 
 ---
 
-`;
+${CACHE_BREAK}`;
   }
   return `You are a note taking expert. Here is a part of audio processed, so it might contain small errors on recognizing what the word is. If it does not make sense to you, maybe search for some word of similar pronunciation that fits in the topic. 
 